@@ -27,7 +27,10 @@ else
 fi
 
 echo ">>> Starting Django server..."
-exec gunicorn credit_system.wsgi:application \
+# ASGI via uvicorn workers: the async read views overlap DB latency
+# instead of blocking a sync worker per request
+exec gunicorn credit_system.asgi:application \
+    --worker-class uvicorn.workers.UvicornWorker \
     --bind 0.0.0.0:8000 \
     --workers 2 \
     --timeout 120
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['customer', 'end_date'], name='loan_cust_enddate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['customer', 'start_date'], name='loan_cust_startdate_idx'),
+        ),
+    ]
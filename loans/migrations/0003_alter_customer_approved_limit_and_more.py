@@ -0,0 +1,39 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:33
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0002_loan_loan_cust_enddate_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='approved_limit',
+            field=models.DecimalField(decimal_places=2, max_digits=14, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='current_debt',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='monthly_income',
+            field=models.DecimalField(decimal_places=2, max_digits=14, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='loan',
+            name='loan_amount',
+            field=models.DecimalField(decimal_places=2, max_digits=14, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='loan',
+            name='monthly_installment',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
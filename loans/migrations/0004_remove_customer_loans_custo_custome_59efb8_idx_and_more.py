@@ -0,0 +1,25 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0003_alter_customer_approved_limit_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='loans_custo_custome_59efb8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='loan',
+            name='loans_loan_loan_id_4268fd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['customer'], include=('loan_amount', 'status', 'interest_rate', 'monthly_installment', 'tenure', 'emis_paid'), name='loan_by_cust_covering'),
+        ),
+    ]
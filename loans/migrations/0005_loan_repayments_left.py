@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:41
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0004_remove_customer_loans_custo_custome_59efb8_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='repayments_left',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('tenure'), '-', models.F('emis_paid')), output_field=models.IntegerField()),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0005_loan_repayments_left'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerLoanStats',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='loan_stats', serialize=False, to='loans.customer')),
+                ('past_total', models.IntegerField(default=0)),
+                ('past_on_time', models.IntegerField(default=0)),
+                ('past_current_year', models.IntegerField(default=0)),
+                ('past_avg_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('current_debt', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('current_emi', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('as_of', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:50
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0006_customerloanstats'),
+    ]
+
+    # Generated columns cannot be altered in place; drop and re-add the
+    # column with the clamped expression
+    operations = [
+        migrations.RemoveField(
+            model_name='loan',
+            name='repayments_left',
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='repayments_left',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(models.F('tenure'), '-', models.F('emis_paid')), models.Value(0)), output_field=models.IntegerField()),
+        ),
+    ]
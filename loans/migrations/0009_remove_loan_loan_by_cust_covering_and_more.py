@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0008_remove_loan_loan_by_cust_covering_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='loan',
+            name='loan_by_cust_covering',
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['customer', '-created_at'], include=('loan_amount', 'status', 'interest_rate', 'monthly_installment', 'tenure', 'emis_paid', 'repayments_left'), name='loan_by_cust_covering'),
+        ),
+    ]
@@ -1,7 +1,9 @@
-from datetime import datetime
+from datetime import timedelta
 
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
 
 class Customer(models.Model):
@@ -12,17 +14,25 @@ class Customer(models.Model):
     last_name = models.CharField(max_length=100)
     age = models.IntegerField(validators=[MinValueValidator(18)])
     phone_number = models.CharField(max_length=20, unique=True)
-    monthly_income = models.FloatField(validators=[MinValueValidator(0)])
-    approved_limit = models.FloatField(validators=[MinValueValidator(0)])
-    current_debt = models.FloatField(default=0, validators=[MinValueValidator(0)])
+    # Money columns are fixed-point: exact aggregation in the DB and no
+    # accumulated float error on balances
+    monthly_income = models.DecimalField(
+        max_digits=14, decimal_places=2, validators=[MinValueValidator(0)]
+    )
+    approved_limit = models.DecimalField(
+        max_digits=14, decimal_places=2, validators=[MinValueValidator(0)]
+    )
+    current_debt = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, validators=[MinValueValidator(0)]
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        # customer_id is the primary key and already uniquely indexed
         indexes = [
             models.Index(fields=["phone_number"]),
-            models.Index(fields=["customer_id"]),
         ]
 
     def __str__(self) -> str:
@@ -34,9 +44,11 @@ class Customer(models.Model):
 
     @property
     def total_emis_for_month(self) -> float:
-        """Calculate total EMIs due for current month"""
-        loans = Loan.objects.filter(customer=self, end_date__gte=datetime.now().date())
-        return sum(loan.monthly_installment for loan in loans)
+        """Calculate total EMIs due for current month (summed in SQL)"""
+        total = Loan.objects.filter(
+            customer=self, status="approved", end_date__gte=timezone.localdate()
+        ).aggregate(total=models.Sum("monthly_installment"))["total"]
+        return total or 0.0
 
 
 class Loan(models.Model):
@@ -50,14 +62,27 @@ class Loan(models.Model):
 
     loan_id = models.AutoField(primary_key=True)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
-    loan_amount = models.FloatField(validators=[MinValueValidator(0)])
+    loan_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, validators=[MinValueValidator(0)]
+    )
     tenure = models.IntegerField(validators=[MinValueValidator(1)])  # in months
     interest_rate = models.FloatField(validators=[MinValueValidator(0)])
-    monthly_installment = models.FloatField(
-        default=0, validators=[MinValueValidator(0)]
+    monthly_installment = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, validators=[MinValueValidator(0)]
     )
     status = models.CharField(max_length=20, choices=APPROVAL_STATUS, default="pending")
     emis_paid = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    # Derived once in the database instead of per-row in Python; stored so
+    # it can be filtered/indexed (e.g. WHERE repayments_left > 0). Clamped
+    # at zero: nothing constrains emis_paid <= tenure, and bulk-loaded
+    # sheets can overpay
+    repayments_left = models.GeneratedField(
+        expression=Greatest(
+            models.F("tenure") - models.F("emis_paid"), models.Value(0)
+        ),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -65,20 +90,89 @@ class Loan(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # loan_id (PK) and the customer FK get indexes automatically
         indexes = [
             models.Index(fields=["customer", "status"]),
-            models.Index(fields=["loan_id"]),
+            # Covering index for view_loans_by_customer: keyed to match the
+            # query's filter and its ORDER BY created_at DESC (from
+            # Meta.ordering), with the selected columns INCLUDEd, so on
+            # PostgreSQL the listing is answered index-only with no sort;
+            # other backends create it as a plain index (INCLUDE is ignored)
+            models.Index(
+                fields=["customer", "-created_at"],
+                include=[
+                    "loan_amount",
+                    "status",
+                    "interest_rate",
+                    "monthly_installment",
+                    "tenure",
+                    "emis_paid",
+                    "repayments_left",
+                ],
+                name="loan_by_cust_covering",
+            ),
+            # Partial indexes matching the hot approved-loan date-range
+            # filters in total_emis_for_month and the credit-score queries
+            models.Index(
+                fields=["customer", "end_date"],
+                name="loan_cust_enddate_idx",
+                condition=models.Q(status="approved"),
+            ),
+            models.Index(
+                fields=["customer", "start_date"],
+                name="loan_cust_startdate_idx",
+                condition=models.Q(status="approved"),
+            ),
         ]
 
     def __str__(self) -> str:
         return f"Loan {self.loan_id} - Customer {self.customer.customer_id}"
 
-    @property
-    def repayments_left(self) -> int:
-        """Calculate remaining EMIs"""
-        return max(0, self.tenure - self.emis_paid)
+    def save(self, *args, **kwargs):
+        """Precompute the EMI once on save so reads are plain attribute access"""
+        if not self.monthly_installment and self.loan_amount and self.tenure:
+            from .utils import calculate_monthly_installment
+
+            self.monthly_installment = round(
+                calculate_monthly_installment(
+                    float(self.loan_amount), self.interest_rate, self.tenure
+                ),
+                2,
+            )
+        # Default the schedule for new loans; bulk loads supply explicit
+        # dates (historical end dates are real, not derived from tenure)
+        if self.start_date is None:
+            self.start_date = timezone.localdate()
+        if self.end_date is None and self.tenure:
+            self.end_date = self.start_date + timedelta(days=30 * self.tenure)
+        super().save(*args, **kwargs)
 
     @property
     def is_active(self) -> bool:
         """Check if loan is still active"""
         return self.status == "approved" and self.repayments_left > 0
+
+
+class CustomerLoanStats(models.Model):
+    """
+    Denormalized per-customer loan aggregates so eligibility is a
+    single-row PK lookup instead of scanning the customer's loans.
+    Maintained by signals on Loan writes; the past/active partition
+    shifts as dates pass, so rows carry the date they were computed for
+    and readers fall back to a live aggregate when stale.
+    """
+
+    customer = models.OneToOneField(
+        Customer, on_delete=models.CASCADE, primary_key=True, related_name="loan_stats"
+    )
+    past_total = models.IntegerField(default=0)
+    past_on_time = models.IntegerField(default=0)
+    past_current_year = models.IntegerField(default=0)
+    past_avg_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    current_debt = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    current_emi = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    as_of = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Loan stats for customer {self.customer_id} as of {self.as_of}"
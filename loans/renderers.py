@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    """Fallback for types orjson doesn't serialize natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    DRF renderer backed by orjson, which serializes small dict payloads
+    several times faster than the stdlib json module used by DRF's default
+    JSONRenderer. Decimal model fields are rendered as JSON numbers.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # OPT_NON_STR_KEYS: DRF error dicts can be keyed by int (e.g.
+        # ListSerializer.errors indexes failing items); stdlib json coerces
+        # such keys to strings and orjson must match, not raise
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
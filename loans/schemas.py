@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class EligibilityIn(BaseModel):
+    """Request body for POST /api/check-eligibility"""
+
+    customer_id: int
+    loan_amount: float = Field(ge=0)
+    interest_rate: float = Field(ge=0)
+    tenure: int = Field(ge=1)
+
+
+class CreateLoanIn(BaseModel):
+    """Request body for POST /api/create-loan"""
+
+    customer_id: int
+    loan_amount: float = Field(ge=0)
+    interest_rate: float = Field(ge=0)
+    tenure: int = Field(ge=1)
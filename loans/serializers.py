@@ -1,3 +1,4 @@
+from django.db import IntegrityError
 from rest_framework import serializers
 
 from .models import Customer, Loan
@@ -6,7 +7,9 @@ from .models import Customer, Loan
 class CustomerSerializer(serializers.ModelSerializer):
     """Serializer for Customer model"""
 
-    name = serializers.SerializerMethodField()
+    # Reads the Customer.name property directly; cheaper than a
+    # SerializerMethodField and keeps schema generation simple
+    name = serializers.CharField(read_only=True)
 
     class Meta:
         model = Customer
@@ -23,14 +26,11 @@ class CustomerSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["customer_id", "approved_limit", "current_debt"]
 
-    def get_name(self, obj) -> str:
-        return f"{obj.first_name} {obj.last_name}"
-
 
 class CustomerDetailSerializer(serializers.ModelSerializer):
     """Detailed customer serializer with calculated fields"""
 
-    name = serializers.SerializerMethodField()
+    name = serializers.CharField(read_only=True)
     total_emis = serializers.SerializerMethodField()
 
     class Meta:
@@ -46,10 +46,12 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
             "total_emis",
         ]
 
-    def get_name(self, obj):
-        return f"{obj.first_name} {obj.last_name}"
-
     def get_total_emis(self, obj):
+        # Prefer a queryset-level annotation (one query for the whole list)
+        # over the per-object property, which queries per customer
+        total_emis = getattr(obj, "total_emis", None)
+        if total_emis is not None:
+            return total_emis
         return obj.total_emis_for_month
 
 
@@ -101,6 +103,23 @@ class LoanDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ["loan_id", "customer_details", "repayments_left"]
 
 
+def calculate_approved_limit(monthly_income: float) -> float:
+    """approved_limit = 36 * monthly_salary, rounded to nearest lakh"""
+    return round(monthly_income * 36 / 100000) * 100000
+
+
+def build_customer(validated_data: dict) -> Customer:
+    """Construct an unsaved Customer from registration data"""
+    return Customer(
+        first_name=validated_data["first_name"],
+        last_name=validated_data["last_name"],
+        age=validated_data["age"],
+        phone_number=validated_data["phone_number"],
+        monthly_income=validated_data["monthly_income"],
+        approved_limit=calculate_approved_limit(validated_data["monthly_income"]),
+    )
+
+
 class RegisterCustomerSerializer(serializers.Serializer):
     """Serializer for customer registration"""
 
@@ -110,39 +129,20 @@ class RegisterCustomerSerializer(serializers.Serializer):
     monthly_income = serializers.FloatField(min_value=0)
     phone_number = serializers.CharField(max_length=20)
 
-    def validate_phone_number(self, value):
-        """Validate unique phone number"""
-        if Customer.objects.filter(phone_number=value).exists():
-            raise serializers.ValidationError("Phone number already registered.")
-        return value
-
     def create(self, validated_data):
         """Create new customer with calculated approved limit"""
-        # approved_limit = 36 * monthly_salary (rounded to nearest lakh)
-        approved_limit = validated_data["monthly_income"] * 36
-        # Round to nearest lakh (100,000)
-        approved_limit = round(approved_limit / 100000) * 100000
-
-        customer = Customer.objects.create(
-            first_name=validated_data["first_name"],
-            last_name=validated_data["last_name"],
-            age=validated_data["age"],
-            phone_number=validated_data["phone_number"],
-            monthly_income=validated_data["monthly_income"],
-            approved_limit=approved_limit,
-        )
+        # phone_number is unique=True; let the database enforce it instead
+        # of a pre-check query (also closes the check-then-insert race)
+        customer = build_customer(validated_data)
+        try:
+            customer.save()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"phone_number": "Phone number already registered."}
+            )
         return customer
 
 
-class EligibilityCheckSerializer(serializers.Serializer):
-    """Serializer for loan eligibility check"""
-
-    customer_id = serializers.IntegerField()
-    loan_amount = serializers.FloatField(min_value=0)
-    interest_rate = serializers.FloatField(min_value=0)
-    tenure = serializers.IntegerField(min_value=1)
-
-
 class EligibilityResponseSerializer(serializers.Serializer):
     """Response serializer for eligibility check"""
 
@@ -154,15 +154,6 @@ class EligibilityResponseSerializer(serializers.Serializer):
     monthly_installment = serializers.FloatField()
 
 
-class CreateLoanSerializer(serializers.Serializer):
-    """Serializer for creating a new loan"""
-
-    customer_id = serializers.IntegerField()
-    loan_amount = serializers.FloatField(min_value=0)
-    interest_rate = serializers.FloatField(min_value=0)
-    tenure = serializers.IntegerField(min_value=1)
-
-
 class CreateLoanResponseSerializer(serializers.Serializer):
     """Response serializer for loan creation"""
 
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Loan
+from .utils import refresh_customer_loan_stats
+
+
+@receiver(post_save, sender=Loan)
+@receiver(post_delete, sender=Loan)
+def refresh_loan_stats(sender, instance: Loan, **kwargs) -> None:
+    """Keep the customer's denormalized loan stats in step with writes.
+
+    Bulk paths (bulk_create, COPY) bypass signals; readers detect the
+    missing/stale row via its as_of date and aggregate live instead.
+    """
+    refresh_customer_loan_stats(instance.customer_id)
@@ -5,6 +5,9 @@ from . import views
 urlpatterns = [
     # Customer APIs
     path("register", views.register_customer, name="register"),
+    path(
+        "register-bulk", views.register_customers_bulk, name="register-bulk"
+    ),
     # Loan APIs
     path("check-eligibility", views.check_eligibility, name="check-eligibility"),
     path("create-loan", views.create_loan, name="create-loan"),
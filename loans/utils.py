@@ -1,11 +1,14 @@
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import date
+from functools import lru_cache
 
-from django.db.models import Avg
+import numpy as np
+from django.db.models import Avg, Count, F, Q, Sum
+from django.utils import timezone
 
-from .models import Customer, Loan
+from .models import Customer, CustomerLoanStats, Loan
 
 
+@lru_cache(maxsize=8192)
 def calculate_monthly_installment(
     principal: float, annual_interest_rate: float, tenure_months: int
 ) -> float:
@@ -16,21 +19,96 @@ def calculate_monthly_installment(
     P = Principal (loan amount)
     r = Monthly interest rate (annual_rate / 12 / 100)
     n = Tenure in months
+
+    Pure function of its arguments, so results are memoized: eligibility
+    previews hammer the same (amount, rate, tenure) triples and warm
+    calls become a dict lookup instead of a float power.
     """
     if tenure_months == 0 or annual_interest_rate == 0:
         return principal / tenure_months if tenure_months > 0 else 0
 
     monthly_rate = (annual_interest_rate / 12) / 100
-    numerator = principal * (monthly_rate * (1 + monthly_rate) ** tenure_months)
-    denominator = ((1 + monthly_rate) ** tenure_months) - 1
+    # Compute the compounding factor once instead of evaluating the power twice
+    factor = (1.0 + monthly_rate) ** tenure_months
 
-    if denominator == 0:
+    if factor == 1.0:
         return principal / tenure_months
 
-    return numerator / denominator
+    return principal * monthly_rate * factor / (factor - 1.0)
 
 
-def calculate_credit_score(customer: Customer) -> float:
+def calculate_monthly_installments_batch(
+    principals, annual_interest_rates, tenure_months
+) -> np.ndarray:
+    """
+    Vectorized EMI over arrays of (principal, rate, tenure) triples.
+    Same annuity formula as calculate_monthly_installment, evaluated in
+    NumPy so thousands of candidate loans can be scored in one shot
+    (e.g. previewing EMI across a grid of amounts/tenures).
+    """
+    principals = np.asarray(principals, dtype=np.float64)
+    rates = np.asarray(annual_interest_rates, dtype=np.float64)
+    tenures = np.asarray(tenure_months, dtype=np.float64)
+
+    monthly_rates = rates / 1200.0
+    factors = (1.0 + monthly_rates) ** tenures
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emis = principals * monthly_rates * factors / (factors - 1.0)
+        # Zero rate (or zero compounding factor delta) degrades to straight
+        # division, and zero tenure to 0 - matching the scalar function
+        flat = np.divide(
+            principals, tenures, out=np.zeros_like(principals), where=tenures > 0
+        )
+        emis = np.where((monthly_rates == 0) | (factors == 1.0), flat, emis)
+
+    return emis
+
+
+def approved_loan_stats(customer: Customer | int, today: date) -> dict:
+    """
+    Everything the eligibility pipeline needs to know about a customer's
+    approved loans, computed in one filtered-aggregate query: past-loan
+    counts and average for the credit score, plus outstanding debt and
+    EMI totals for the affordability checks. Accepts a Customer or a pk.
+    """
+    past = Q(end_date__lt=today)
+    active = Q(end_date__gte=today)
+    return Loan.objects.filter(customer=customer, status="approved").aggregate(
+        past_total=Count("pk", filter=past),
+        past_on_time=Count("pk", filter=past & Q(emis_paid=F("tenure"))),
+        past_current_year=Count(
+            "pk", filter=past & Q(start_date__gte=today.replace(month=1, day=1))
+        ),
+        past_avg_amount=Avg("loan_amount", filter=past),
+        current_debt=Sum("loan_amount", filter=active),
+        current_emi=Sum("monthly_installment", filter=active),
+    )
+
+
+def refresh_customer_loan_stats(customer_id: int) -> None:
+    """Recompute and upsert the denormalized stats row for a customer"""
+    today = timezone.localdate()
+    stats = approved_loan_stats(customer_id, today)
+    CustomerLoanStats.objects.update_or_create(
+        customer_id=customer_id,
+        defaults={
+            "past_total": stats["past_total"],
+            "past_on_time": stats["past_on_time"],
+            "past_current_year": stats["past_current_year"],
+            "past_avg_amount": stats["past_avg_amount"] or 0,
+            "current_debt": stats["current_debt"] or 0,
+            "current_emi": stats["current_emi"] or 0,
+            "as_of": today,
+        },
+    )
+
+
+def calculate_credit_score(
+    customer: Customer,
+    stats: dict | None = None,
+    today: date | None = None,
+) -> float:
     """
     Calculate credit score (0-100) based on historical loan data
     Components:
@@ -39,48 +117,50 @@ def calculate_credit_score(customer: Customer) -> float:
     3. Loan activity in current year (20 points)
     4. Loan approved volume (20 points)
     5. Exceeding approved limit (automatic 0 score)
+
+    Callers that already ran approved_loan_stats can pass the result in
+    to avoid re-querying.
     """
-    # Get customer's past loans
-    past_loans = Loan.objects.filter(
-        customer=customer, status="approved", end_date__lt=datetime.now().date()
-    )
+    # localdate() uses Django's cached timezone; hoisted so the date is
+    # resolved once per call (callers may pass it down to stay consistent)
+    if today is None:
+        today = timezone.localdate()
 
-    # Get current active loans
-    current_loans = Loan.objects.filter(
-        customer=customer, status="approved", end_date__gte=datetime.now().date()
-    )
+    if stats is None:
+        stats = approved_loan_stats(customer, today)
+
+    num_past_loans = stats["past_total"]
+    emis_paid_on_time = stats["past_on_time"]
+    current_year_loans = stats["past_current_year"]
+    avg_loan_amount = stats["past_avg_amount"] or 0
+    total_current_debt = stats["current_debt"] or 0
+
+    # Scoring is approximate: do the ratio math in float regardless of
+    # whether the amounts came back as Decimal
+    avg_loan_amount = float(avg_loan_amount)
 
     # Check if current debt exceeds approved limit
-    total_current_debt = sum(loan.loan_amount for loan in current_loans)
     if total_current_debt > customer.approved_limit:
         return 0
 
     score = 0.0
 
     # 1. Past loans paid on time (25 points)
-    if past_loans.exists():
-        first_loan = past_loans.first()
-        if first_loan and first_loan.tenure > 0:
-            emis_paid_on_time = past_loans.filter(emis_paid=first_loan.tenure).count()
-            score += (emis_paid_on_time / past_loans.count()) * 25
+    if num_past_loans:
+        score += (emis_paid_on_time / num_past_loans) * 25
 
     # 2. Number of loans taken in past (20 points)
     # More loans = better history (max 20 points for 5+ loans)
-    num_past_loans = past_loans.count()
     score += min(20, (num_past_loans / 5) * 20)
 
     # 3. Loan activity in current year (20 points)
-    current_year_start = datetime(datetime.now().year, 1, 1).date()
-    current_year_loans = past_loans.filter(start_date__gte=current_year_start).count()
     score += min(20, (current_year_loans / 3) * 20)
 
     # 4. Loan approved volume (20 points)
     # Higher approved amounts = higher score
-    if past_loans.exists():
-        avg_loan_amount = past_loans.aggregate(avg=Avg("loan_amount"))["avg"] or 0
+    if num_past_loans and customer.approved_limit > 0:
         # Normalize to approved limit
-        if customer.approved_limit > 0:
-            score += min(20, (avg_loan_amount / customer.approved_limit) * 20)
+        score += min(20, (avg_loan_amount / float(customer.approved_limit)) * 20)
 
     return min(100, score)
 
@@ -92,19 +172,35 @@ def check_loan_eligibility(
     Check loan eligibility based on credit score and other factors
     Returns: (is_eligible, corrected_rate, monthly_emi, credit_score)
     """
+    # Prefer the denormalized stats row (single PK lookup, O(1) in the
+    # customer's history); fall back to the live aggregate when the row is
+    # missing or was computed for an earlier date
+    today = timezone.localdate()
+    stats = (
+        CustomerLoanStats.objects.filter(customer_id=customer.pk, as_of=today)
+        .values(
+            "past_total",
+            "past_on_time",
+            "past_current_year",
+            "past_avg_amount",
+            "current_debt",
+            "current_emi",
+        )
+        .first()
+    )
+    if stats is None:
+        stats = approved_loan_stats(customer, today)
+
     # Calculate credit score
-    credit_score = calculate_credit_score(customer)
+    credit_score = calculate_credit_score(customer, stats=stats, today=today)
 
     # Check if sum of current EMIs exceeds 50% of monthly salary
-    current_emis_sum = customer.total_emis_for_month
-    if current_emis_sum > (customer.monthly_income * 0.5):
+    current_emis_sum = float(stats["current_emi"] or 0)
+    if current_emis_sum > (float(customer.monthly_income) * 0.5):
         return False, interest_rate, 0, credit_score
 
     # Check if requested loan + current debt exceeds approved limit
-    active_loans = Loan.objects.filter(
-        customer=customer, status="approved", end_date__gte=datetime.now().date()
-    )
-    total_debt = sum(loan.loan_amount for loan in active_loans) + loan_amount
+    total_debt = float(stats["current_debt"] or 0) + loan_amount
 
     if total_debt > customer.approved_limit:
         return False, interest_rate, 0, credit_score
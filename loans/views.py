@@ -1,19 +1,30 @@
-from datetime import datetime, timedelta
-
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, JsonResponse
+
 from .models import Customer, Loan
-from .serializers import (
-    CreateLoanSerializer,
-    EligibilityCheckSerializer,
-    RegisterCustomerSerializer,
-)
+from pydantic import ValidationError
+
+from .schemas import CreateLoanIn, EligibilityIn
+from .serializers import RegisterCustomerSerializer, build_customer
 from .utils import calculate_monthly_installment, check_loan_eligibility
 
 
+def _eligibility_cache_key(customer_id, loan_amount, interest_rate, tenure) -> str:
+    """
+    Cache key for an eligibility preview. Includes a per-customer version
+    so create_loan can invalidate every cached preview for a customer by
+    bumping one counter instead of tracking individual keys.
+    """
+    version = cache.get_or_set(f"cust_ver:{customer_id}", 0)
+    return f"elig:{version}:{customer_id}:{loan_amount}:{interest_rate}:{tenure}"
+
+
 @api_view(["POST"])
 def register_customer(request: Request) -> Response:
     """
@@ -37,27 +48,81 @@ def register_customer(request: Request) -> Response:
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+def register_customers_bulk(request: Request) -> Response:
+    """
+    Register a batch of customers in one multi-row INSERT
+    POST /api/register-bulk
+    """
+    serializer = RegisterCustomerSerializer(data=request.data, many=True)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    customers = [build_customer(item) for item in serializer.validated_data]  # type: ignore
+    try:
+        # One INSERT per 1000 rows instead of one per customer; atomic so a
+        # duplicate phone rejects the whole batch rather than part of it
+        with transaction.atomic():
+            Customer.objects.bulk_create(customers, batch_size=1000)
+    except IntegrityError:
+        return Response(
+            {"phone_number": "One or more phone numbers already registered."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        [
+            {
+                "customer_id": customer.customer_id,
+                "name": customer.name,
+                "age": customer.age,
+                "monthly_income": customer.monthly_income,
+                "approved_limit": customer.approved_limit,
+                "phone_number": customer.phone_number,
+            }
+            for customer in customers
+        ],
+        status=status.HTTP_201_CREATED,
+    )
+
+
 @api_view(["POST"])
 def check_eligibility(request: Request) -> Response:
     """
     Check loan eligibility based on credit score
     POST /api/check-eligibility
     """
-    serializer = EligibilityCheckSerializer(data=request.data)
-    if not serializer.is_valid():
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    # pydantic's Rust-core validator parses this 4-field payload far
+    # cheaper than a DRF serializer
+    try:
+        data = EligibilityIn.model_validate(request.data)
+    except ValidationError as e:
+        return Response(e.errors(include_url=False), status=status.HTTP_400_BAD_REQUEST)
+
+    customer_id = data.customer_id
+    loan_amount = data.loan_amount
+    interest_rate = data.interest_rate
+    tenure = data.tenure
+
+    # Eligibility is a pure function of the payload and the customer's loan
+    # state; frontends previewing rates hit this repeatedly, so serve
+    # repeats from a short-TTL cache
+    cache_key = _eligibility_cache_key(customer_id, loan_amount, interest_rate, tenure)
+    response_data = cache.get(cache_key)
+    if response_data is not None:
+        return Response(response_data, status=status.HTTP_200_OK)
 
     try:
-        customer = Customer.objects.get(customer_id=serializer.validated_data["customer_id"])  # type: ignore
+        # Project only the fields the eligibility check reads; the rest of
+        # the customer row is dead weight on this hot path
+        customer = Customer.objects.only(
+            "customer_id", "monthly_income", "approved_limit"
+        ).get(customer_id=customer_id)
     except Customer.DoesNotExist:
         return Response(
             {"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    loan_amount = serializer.validated_data["loan_amount"]  # type: ignore
-    interest_rate = serializer.validated_data["interest_rate"]  # type: ignore
-    tenure = serializer.validated_data["tenure"]  # type: ignore
-
     # Check eligibility
     is_approved, corrected_rate, monthly_emi, credit_score = check_loan_eligibility(
         customer, loan_amount, interest_rate, tenure
@@ -71,6 +136,7 @@ def check_eligibility(request: Request) -> Response:
         "tenure": tenure,
         "monthly_installment": round(monthly_emi, 2) if monthly_emi > 0 else 0,
     }
+    cache.set(cache_key, response_data, timeout=30)
 
     return Response(response_data, status=status.HTTP_200_OK)
 
@@ -81,52 +147,63 @@ def create_loan(request: Request) -> Response:
     Create a new loan based on eligibility
     POST /api/create-loan
     """
-    serializer = CreateLoanSerializer(data=request.data)
-    if not serializer.is_valid():
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
     try:
-        customer = Customer.objects.get(customer_id=serializer.validated_data["customer_id"])  # type: ignore
-    except Customer.DoesNotExist:
-        return Response(
-            {"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND
-        )
+        data = CreateLoanIn.model_validate(request.data)
+    except ValidationError as e:
+        return Response(e.errors(include_url=False), status=status.HTTP_400_BAD_REQUEST)
 
-    loan_amount = serializer.validated_data["loan_amount"]  # type: ignore
-    interest_rate = serializer.validated_data["interest_rate"]  # type: ignore
-    tenure = serializer.validated_data["tenure"]  # type: ignore
+    # One transaction around check-then-insert: the row lock serializes
+    # concurrent applications for the same customer, so two requests can't
+    # both pass the approved-limit check and over-lend
+    with transaction.atomic():
+        try:
+            customer = (
+                Customer.objects.select_for_update()
+                .only("customer_id", "monthly_income", "approved_limit")
+                .get(customer_id=data.customer_id)
+            )
+        except Customer.DoesNotExist:
+            return Response(
+                {"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND
+            )
 
-    # Check eligibility
-    is_approved, corrected_rate, monthly_emi, credit_score = check_loan_eligibility(
-        customer, loan_amount, interest_rate, tenure
-    )
+        loan_amount = data.loan_amount
+        interest_rate = data.interest_rate
+        tenure = data.tenure
 
-    if not is_approved:
-        return Response(
-            {
-                "loan_id": None,
-                "customer_id": customer.customer_id,
-                "loan_approved": False,
-                "message": "Loan cannot be approved based on credit score and financial criteria.",
-                "monthly_installment": 0,
-            },
-            status=status.HTTP_200_OK,
+        # Check eligibility
+        is_approved, corrected_rate, monthly_emi, credit_score = check_loan_eligibility(
+            customer, loan_amount, interest_rate, tenure
         )
 
-    # Create the loan
-    start_date = datetime.now().date()
-    end_date = start_date + timedelta(days=30 * tenure)
-
-    loan = Loan.objects.create(
-        customer=customer,
-        loan_amount=loan_amount,
-        tenure=tenure,
-        interest_rate=corrected_rate,
-        monthly_installment=round(monthly_emi, 2),
-        status="approved",
-        start_date=start_date,
-        end_date=end_date,
-    )
+        if not is_approved:
+            return Response(
+                {
+                    "loan_id": None,
+                    "customer_id": customer.customer_id,
+                    "loan_approved": False,
+                    "message": "Loan cannot be approved based on credit score and financial criteria.",
+                    "monthly_installment": 0,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        # Create the loan; Loan.save() fills start_date/end_date
+        loan = Loan.objects.create(
+            customer=customer,
+            loan_amount=loan_amount,
+            tenure=tenure,
+            interest_rate=corrected_rate,
+            monthly_installment=round(monthly_emi, 2),
+            status="approved",
+        )
+
+    # The new loan changes the customer's debt/EMI picture: drop their
+    # cached eligibility previews by bumping the version key
+    try:
+        cache.incr(f"cust_ver:{loan.customer_id}")
+    except ValueError:
+        pass  # no previews cached yet
 
     return Response(
         {
@@ -140,16 +217,22 @@ def create_loan(request: Request) -> Response:
     )
 
 
-@api_view(["GET"])
-def view_loan(request: Request, loan_id: int) -> Response:
+async def view_loan(request: HttpRequest, loan_id: int) -> JsonResponse:
     """
     View loan details with customer information
     GET /api/view-loan/<loan_id>
+
+    Plain Django view: these read endpoints take no request body and
+    return known-shape dicts, so DRF's negotiation/renderer machinery is
+    pure overhead here. Async so an ASGI worker can serve other requests
+    while the query is in flight.
     """
     try:
-        loan = Loan.objects.get(loan_id=loan_id)
+        # JOIN the customer row up front; accessing loan.customer below
+        # would otherwise issue a second query
+        loan = await Loan.objects.select_related("customer").aget(loan_id=loan_id)
     except Loan.DoesNotExist:
-        return Response({"error": "Loan not found"}, status=status.HTTP_404_NOT_FOUND)
+        return JsonResponse({"error": "Loan not found"}, status=404)
 
     customer = loan.customer
     response_data = {
@@ -161,44 +244,58 @@ def view_loan(request: Request, loan_id: int) -> Response:
             "phone_number": customer.phone_number,
             "age": customer.age,
         },
-        "loan_amount": loan.loan_amount,
+        # float() the Decimal money fields: DjangoJSONEncoder would emit
+        # them as JSON strings, and the API contract is numbers
+        "loan_amount": float(loan.loan_amount),
         "is_loan_approved": loan.status == "approved",
         "interest_rate": loan.interest_rate,
-        "monthly_installment": loan.monthly_installment,
+        "monthly_installment": float(loan.monthly_installment),
         "tenure": loan.tenure,
     }
 
-    return Response(response_data, status=status.HTTP_200_OK)
+    return JsonResponse(response_data)
 
 
-@api_view(["GET"])
-def view_loans_by_customer(request: Request, customer_id: int) -> Response:
+async def view_loans_by_customer(request: HttpRequest, customer_id: int) -> JsonResponse:
     """
     View all loans of a customer
     GET /api/view-loans/<customer_id>
+
+    Plain Django view, same reasoning as view_loan.
     """
-    try:
-        customer = Customer.objects.get(customer_id=customer_id)
-    except Customer.DoesNotExist:
-        return Response(
-            {"error": "Customer not found"}, status=status.HTTP_404_NOT_FOUND
+    # One query for the happy path: .values() hands back plain dicts
+    # straight from the driver - no Loan instances to construct - and the
+    # customer existence check only runs when the list comes back empty,
+    # to disambiguate 404 from no loans
+    rows = [
+        row
+        async for row in Loan.objects.filter(customer_id=customer_id).values(
+            "loan_id",
+            "loan_amount",
+            "status",
+            "interest_rate",
+            "monthly_installment",
+            "tenure",
+            "emis_paid",
+            "repayments_left",
         )
+    ]
 
-    loans = Loan.objects.filter(customer=customer)
-    loans_data = []
+    if not rows and not await Customer.objects.filter(pk=customer_id).aexists():
+        return JsonResponse({"error": "Customer not found"}, status=404)
 
-    for loan in loans:
-        loans_data.append(
-            {
-                "loan_id": loan.loan_id,
-                "loan_amount": loan.loan_amount,
-                "is_loan_approved": loan.status == "approved",
-                "interest_rate": loan.interest_rate,
-                "monthly_installment": loan.monthly_installment,
-                "tenure": loan.tenure,
-                "emis_paid": loan.emis_paid,
-                "repayments_left": loan.repayments_left,
-            }
-        )
+    loans_data = [
+        {
+            "loan_id": row["loan_id"],
+            "loan_amount": float(row["loan_amount"]),
+            "is_loan_approved": row["status"] == "approved",
+            "interest_rate": row["interest_rate"],
+            "monthly_installment": float(row["monthly_installment"]),
+            "tenure": row["tenure"],
+            "emis_paid": row["emis_paid"],
+            "repayments_left": row["repayments_left"],
+        }
+        for row in rows
+    ]
 
-    return Response(loans_data, status=status.HTTP_200_OK)
+    return JsonResponse(loans_data, safe=False)
@@ -16,35 +16,32 @@ django.setup()
 
 from django.db import connection
 
-# Tables to drop (in correct order to avoid FK constraint errors)
-TABLES_TO_DROP = [
-    "loans_loan",
-    "loans_customer",
-    "django_admin_log",
-    "authtoken_token",
-    "auth_user_groups",
-    "auth_user_user_permissions",
-    "auth_user",
-    "auth_permission",
-    "auth_group_permissions",
-    "auth_group",
-    "django_content_type",
-    "django_session",
-    "django_migrations",
-]
-
 with connection.cursor() as cursor:
     print("Dropping all tables from PostgreSQL...\n")
-    cursor.execute("SET session_replication_role = replica;")  # Disable FK checks
 
-    for table in TABLES_TO_DROP:
+    # Discover the tables instead of hardcoding them, so app tables added
+    # later are swept up automatically
+    cursor.execute("SELECT tablename FROM pg_tables WHERE schemaname = 'public';")
+    tables = [row[0] for row in cursor.fetchall()]
+
+    if not tables:
+        print("  (no tables found)")
+    else:
+        # One statement drops everything: a single round-trip, atomic, and
+        # CASCADE handles FK ordering so no constraint juggling is needed
+        table_list = ", ".join(f'"{table}"' for table in tables)
         try:
-            cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE;')
-            print(f"  ✓ Dropped: {table}")
+            cursor.execute(f"DROP TABLE IF EXISTS {table_list} CASCADE;")
+            print(f"  ✓ Dropped {len(tables)} tables")
         except Exception as e:
-            print(f"  ✗ Failed: {table} → {e}")
-
-    cursor.execute("SET session_replication_role = DEFAULT;")  # Re-enable FK checks
+            # Fall back to per-table drops so the failing table is identifiable
+            print(f"  ✗ Bulk drop failed ({e}); retrying table by table")
+            for table in tables:
+                try:
+                    cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE;')
+                    print(f"  ✓ Dropped: {table}")
+                except Exception as e:
+                    print(f"  ✗ Failed: {table} → {e}")
 
 print("\nAll tables dropped. Now run:")
 print("  python manage.py makemigrations")